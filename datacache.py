@@ -0,0 +1,100 @@
+"""On-disk caches of the parsed YAML, shared by dronify.py and scripts/build_cache.py.
+
+No Streamlit imports here, so the build script can use it without running the
+app. Every cache (pickle sidecar or Parquet copy) is valid only while its
+recorded stamp - the source YAML's (st_mtime_ns, st_size) - still matches the
+file exactly.
+"""
+import os
+import pickle
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
+
+def stamp(path: Path) -> tuple:
+    info = path.stat()
+    return (info.st_mtime_ns, info.st_size)
+
+
+# Schema-metadata key holding the source YAML's stamp in a Parquet copy
+PARQUET_STAMP_KEY = b"dronify.source_stamp"
+
+
+def _stamp_bytes(path_stamp: tuple) -> bytes:
+    return ("%d:%d" % path_stamp).encode()
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".pkl")
+
+
+def atomic_write(dest: Path, write):
+    """Call write(tmp) on a per-process tmp file, then move it over dest."""
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def parse_yaml(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+def write_sidecar(path: Path, obj, path_stamp: tuple):
+    """Pickle obj next to path, recorded against path_stamp (taken before parsing)."""
+    def dump(tmp):
+        with open(tmp, "wb") as f:
+            pickle.dump((path_stamp, obj), f, protocol=pickle.HIGHEST_PROTOCOL)
+    atomic_write(sidecar_path(path), dump)
+
+
+def load_yaml(path: Path):
+    # Parsed copy kept next to the YAML; reused while mtime/size still match
+    path_stamp = stamp(path)
+    try:
+        with open(sidecar_path(path), "rb") as f:
+            cached_stamp, obj = pickle.load(f)
+        if cached_stamp == path_stamp:
+            return obj
+    except Exception:
+        pass
+
+    obj = parse_yaml(path)
+    try:
+        write_sidecar(path, obj, path_stamp)
+    except OSError:
+        pass  # read-only deploy: just parse again next cold start
+    return obj
+
+
+def read_parquet_if_fresh(parquet: Path, source: Path):
+    """The Parquet copy of source as a DataFrame, or None if missing or stale."""
+    import pyarrow.parquet as pq  # optional: callers treat ImportError as a miss
+
+    meta = pq.read_schema(parquet).metadata or {}
+    if meta.get(PARQUET_STAMP_KEY) != _stamp_bytes(stamp(source)):
+        return None
+    return pd.read_parquet(parquet)
+
+
+def write_parquet(df: pd.DataFrame, parquet: Path, source_stamp: tuple):
+    """Write df as the Parquet copy of a source whose stamp was source_stamp."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[PARQUET_STAMP_KEY] = _stamp_bytes(source_stamp)
+    table = table.replace_schema_metadata(meta)
+    atomic_write(parquet, lambda tmp: pq.write_table(table, tmp))
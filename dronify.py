@@ -1,16 +1,33 @@
+from functools import lru_cache
+from html import escape
 import random
+import re
 from pathlib import Path
 import streamlit as st
+import numpy as np
 import pandas as pd
-import yaml
+
+import datacache
 
 # ---------- App setup ----------
 st.set_page_config(page_title="Dronify", layout="wide")
 
 DATASET_PATH = Path("dji_drones_v3.yaml")
 TAXONOMY_PATH = Path("taxonomy.yaml")
-
-RAW_BASE = "https://raw.githubusercontent.com/JonathanGreen79/dronify/main/images/"
+DATASET_PARQUET = DATASET_PATH.with_suffix(".parquet")  # built by scripts/build_cache.py
+
+# Images in static/ are served same-origin (enableStaticServing in
+# .streamlit/config.toml); anything not present locally falls back to the repo copy
+RAW_BASE = "https://raw.githubusercontent.com/JonathanGreen79/dronify/main/static/"
+STATIC_DIR = Path("static")
+STATIC_BASE = "app/static/"
+
+@st.cache_resource(show_spinner=False)
+def local_images() -> frozenset:
+    # Walked once per process, not on every rerun
+    return frozenset(
+        p.relative_to(STATIC_DIR).as_posix() for p in STATIC_DIR.rglob("*") if p.is_file()
+    )
 
 def _restart_app():
     try:
@@ -23,45 +40,141 @@ def _restart_app():
 # ---------------------------------------------------------------------
 # Data helpers
 # ---------------------------------------------------------------------
-def load_yaml(path: Path):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+def load_dataset_frame() -> pd.DataFrame:
+    # Columnar copy of the YAML rows; the YAML stays the source of truth
+    try:
+        df = datacache.read_parquet_if_fresh(DATASET_PARQUET, DATASET_PATH)
+        if df is not None:
+            return df
+    except Exception:
+        pass  # missing, unreadable, or no pyarrow
 
-@st.cache_data(show_spinner=False)
-def load_data():
-    dataset = load_yaml(DATASET_PATH)
-    taxonomy = load_yaml(TAXONOMY_PATH)
-    df = pd.DataFrame(dataset["data"])
+    source_stamp = datacache.stamp(DATASET_PATH)
+    df = pd.DataFrame(datacache.load_yaml(DATASET_PATH)["data"])
+    try:
+        datacache.write_parquet(df, DATASET_PARQUET, source_stamp)
+    except Exception:
+        pass  # read-only deploy, no pyarrow, or column types Arrow can't store
+    return df
+
+_YES = frozenset({"yes", "true", "1", "ok"})
+
+def yesish(val: str) -> bool:
+    return (val if isinstance(val, str) else str(val)).strip().lower() in _YES
+
+_DIGITS_RE = re.compile(r"(\d+)")
+
+def pad_digits_for_natural(s: str) -> str:
+    """Lower-cased with digit runs zero-padded, so "Mini 10" sorts after "Mini 9"."""
+    parts = _DIGITS_RE.split(s.lower())  # digit runs land at the odd positions
+    parts[1::2] = [p.zfill(6) for p in parts[1::2]]
+    return "".join(parts)
+
+def model_card_subs(models: pd.DataFrame) -> list[str]:
+    """'Class: EU … • UK … • Released: …' subtitle per model, built column-wise."""
+    eu = models["eu_class_marking"].fillna("").astype(str).str.strip()
+    uk = models["uk_class_marking"].fillna("").astype(str).str.strip()
+    cls = "Class: EU " + eu.mask(eu == "", "—") + " • UK " + uk.mask(uk == "", "—")
+    cls = cls.where((eu != "") | (uk != ""), "")
+
+    yr = models["year_released"]
+    rel = ("Released: " + yr.astype(str)).where(yr.map(bool), "")
+
+    both = (cls != "") & (rel != "")
+    return (cls + both.map({True: " • ", False: ""}) + rel).tolist()
+
+# Static reference data: returned by reference on every rerun (treat as read-only)
+@st.cache_resource(show_spinner=False)
+def load_drones():
+    df = load_dataset_frame()
 
     needed = [
         "image_url", "segment", "series", "marketing_name", "model_key",
         "mtom_g_nominal", "eu_class_marking", "uk_class_marking",
         "has_camera", "geo_awareness", "remote_id_builtin", "year_released"
     ]
-    for col in needed:
-        if col not in df.columns:
-            df[col] = ""
-
-    df["segment_norm"] = df["segment"].astype(str).str.strip().str.lower()
-    df["series_norm"]  = df["series"].astype(str).str.strip().str.lower()
-    return df, taxonomy
-
+    # One reindex instead of a column insert per missing field
+    df = df.reindex(columns=list(dict.fromkeys([*df.columns, *needed])), fill_value="")
+
+    # One pass per column instead of a .str.strip() and a .str.lower() pass
+    df["segment_norm"] = [v.strip().lower() for v in df["segment"].astype(str).tolist()]
+    df["series_norm"]  = [v.strip().lower() for v in df["series"].astype(str).tolist()]
+    # Natural-sort key per model name, computed once
+    df["name_key"] = df["marketing_name"].astype(str).map(pad_digits_for_natural)
+    df["resolved_image_url"] = _resolve_series(df["image_url"])
+    # Yes/no flags as real booleans so the rules never re-normalise strings
+    for col in ("has_camera", "geo_awareness", "remote_id_builtin"):
+        df[f"{col}_bool"] = df[col].map(yesish).astype(bool)
+    # Low-cardinality labels as categoricals: int codes instead of per-row strings
+    for col in (
+        "segment", "series", "segment_norm", "series_norm", "eu_class_marking", "uk_class_marking",
+        "has_camera", "geo_awareness", "remote_id_builtin", "operator_id_required",
+    ):
+        if col in df.columns:
+            df[col] = df[col].fillna("").astype("category")
+    # Model-card subtitle per row, so the models grid only reads a column
+    df["card_sub"] = model_card_subs(df)
+
+    # Natural order over the whole frame (name key, ties by raw name), sorted once
+    names = df["marketing_name"].to_numpy().astype(str)
+    rank = np.empty(len(df), dtype=np.intp)
+    rank[np.lexsort((names, df["name_key"].to_numpy().astype(str)))] = np.arange(len(df))
+    # Row positions per (segment, series) in that order, for O(1) presorted subsetting
+    groups = df.groupby(["segment_norm", "series_norm"], observed=True).indices
+    lookup = {"by_seg_ser": {k: rows[np.argsort(rank[rows])] for k, rows in groups.items()}}
+    # Row position per model_key (first row wins, as with the old mask + iloc[0])
+    keys = df["model_key"].tolist()
+    lookup["by_model"] = {k: i for i, k in reversed(list(enumerate(keys)))}
+    # Each row as a plain dict, for the product page and grid (read-only)
+    lookup["records"] = df.to_dict(orient="records")
+    # Resolved image URLs per (segment, series) for the series cards
+    urls = df["resolved_image_url"].to_numpy()
+    has_image = urls != ""
+    lookup["series_images"] = {
+        k: urls[rows[has_image[rows]]].tolist() for k, rows in lookup["by_seg_ser"].items()
+    }
+    return df, lookup
+
+# Only the landing/series/product pages need it; the report page never loads it
+@st.cache_resource(show_spinner=False)
+def load_taxonomy():
+    taxonomy = datacache.load_yaml(TAXONOMY_PATH)
+    # Entries by key
+    tax_lookup = {
+        "segments_by_key": {seg["key"]: seg for seg in taxonomy["segments"]},
+        "series_by_key": {
+            (seg["key"], ser["key"]): ser for seg in taxonomy["segments"] for ser in seg["series"]
+        },
+    }
+    return taxonomy, tax_lookup
+
+@lru_cache(maxsize=4096)
 def resolve_img(url: str) -> str:
     url = (url or "").strip()
     if not url:
         return ""
-    low = url.lower()
-    if low.startswith(("http://", "https://", "data:")):
+    head = url[:8].lower()  # prefixes are at most 8 chars; no full lower-cased copy
+    if head.startswith(("http://", "https://", "data:")):
         return url
-    if low.startswith("images/"):
-        return RAW_BASE + url.split("/", 1)[1]
-    return RAW_BASE + url.lstrip("/")
+    rel = url[7:] if head.startswith("images/") else url.lstrip("/")
+    return (STATIC_BASE if rel in local_images() else RAW_BASE) + rel
+
+def _resolve_series(urls: pd.Series) -> pd.Series:
+    """resolve_img over a whole column in a few vectorised passes."""
+    s = urls.fillna("").astype(str).str.strip()
+    low = s.str.lower()
+    rel = s.str.slice(7).where(low.str.startswith("images/"), s.str.lstrip("/"))
+    out = np.where(
+        low.str.startswith(("http://", "https://", "data:")),
+        s,
+        np.where(rel.isin(local_images()), STATIC_BASE + rel, RAW_BASE + rel),
+    )
+    return pd.Series(out, index=s.index, dtype=object).where(s != "", "")
 
 # ---------------------------------------------------------------------
 # UI CSS
 # ---------------------------------------------------------------------
-st.markdown(
-    """
+CSS = """
 <style>
 .block-container { padding-top: .7rem; }
 
@@ -73,6 +186,8 @@ st.markdown(
 section[data-testid="stSidebar"] .block-container { padding-top: .4rem; }
 .sidebar-title { font-weight:800; font-size:1.02rem; margin:.6rem 0 .25rem; }
 .sidebar-kv { margin:.18rem 0; color:#374151; font-size:.90rem; }
+.sidebar-thumb img { width:100%; border-radius:8px; display:block; }
+.sidebar-thumb div { text-align:center; color:#6B7280; font-size:.85rem; margin:.3rem 0 .2rem; }
 section[data-testid="stSidebar"] div[data-testid="stCheckbox"] { margin: 2px 0 !important; }
 section[data-testid="stSidebar"] label p { font-size: .9rem; margin: 0; }
 
@@ -120,111 +235,99 @@ section[data-testid="stSidebar"] label p { font-size: .9rem; margin: 0; }
 .count-bubble { display:inline-block; margin-left:8px; padding:2px 8px; border-radius:999px; background:#111827; color:#fff; font-size:.78rem; }
 .report-hr { height:1px; background:#E5E7EB; margin:10px 0 8px; }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+# Emitted on every run: Streamlit drops elements a rerun doesn't re-emit, so
+# gating this on session_state would strip the styles after the first click.
+st.markdown(CSS, unsafe_allow_html=True)
 
 # ---------------------------------------------------------------------
 # Query params
 # ---------------------------------------------------------------------
-def get_qp():
+def qp_get(key: str, lower: bool = True):
     try:
-        return dict(st.query_params)
+        v = st.query_params.get(key, "")
     except Exception:
-        return {
-            k: (v[0] if isinstance(v, list) else v)
-            for k, v in st.experimental_get_query_params().items()
-        }
+        v = st.experimental_get_query_params().get(key, [""])[0]
+    v = (v or "").strip()
+    return (v.lower() if lower else v) or None
 
-qp = get_qp()
-segment = qp.get("segment")
-series  = qp.get("series")
-model   = qp.get("model")
-page    = qp.get("page")  # 'report' optionally
+segment = qp_get("segment")
+series  = qp_get("series")
+model   = qp_get("model", lower=False)
+page    = qp_get("page")  # 'report' optionally
 
-df, taxonomy = load_data()
+df, lookup = load_drones()
 
 # ---------------------------------------------------------------------
 # Taxonomy helpers
 # ---------------------------------------------------------------------
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+@st.cache_data(show_spinner=False)
 def series_defs_for(segment_key: str):
-    seg = next(s for s in taxonomy["segments"] if s["key"] == segment_key)
+    seg = load_taxonomy()[1]["segments_by_key"][segment_key]
     seg_l = str(segment_key).strip().lower()
-    present = set(
-        df.loc[df["segment_norm"] == seg_l, "series_norm"].dropna().unique().tolist()
-    )
-    out = []
-    for s in seg["series"]:
-        if s["key"].strip().lower() in present:
-            out.append(s)
-    return out
+    # by_seg_ser's keys are exactly the (segment, series) pairs that have models
+    present = lookup["by_seg_ser"]
+    return [s for s in seg["series"] if (seg_l, s["key"].strip().lower()) in present]
 
 def random_image_for_series(segment_key: str, series_key: str) -> str:
     seg_l = str(segment_key).strip().lower()
     ser_l = str(series_key).strip().lower()
-    subset = df[(df["segment_norm"] == seg_l) & (df["series_norm"] == ser_l)]
-    subset = subset[subset["image_url"].astype(str).str.strip() != ""]
-    if subset.empty:
-        return ""
-    raw = str(subset.sample(1)["image_url"].iloc[0])
-    return resolve_img(raw)
+    pool = lookup["series_images"].get((seg_l, ser_l))
+    return random.choice(pool) if pool else SEGMENT_HERO.get(seg_l, "")
 
+# Only what the model cards read
+MODEL_CARD_COLS = ["model_key", "marketing_name", "card_sub", "resolved_image_url"]
+
+@st.cache_data(show_spinner=False)
 def models_for(segment_key: str, series_key: str):
     seg_l = str(segment_key).strip().lower()
     ser_l = str(series_key).strip().lower()
-    subset = df[(df["segment_norm"] == seg_l) & (df["series_norm"] == ser_l)].copy()
-    subset["name_key"] = (
-        subset["marketing_name"]
-        .astype(str)
-        .str.lower()
-        .str.replace(r"\d+", lambda m: f"{int(m.group(0)):06d}", regex=True)
-    )
-    subset = subset.sort_values(
-        by=["name_key", "marketing_name"], kind="stable", ignore_index=True
-    )
-    return subset.drop(columns=["name_key"])
+    # Positions are already in natural order; one take of just the card columns
+    rows = lookup["by_seg_ser"].get((seg_l, ser_l), _NO_ROWS)
+    cols = df.columns.get_indexer(MODEL_CARD_COLS)
+    return df.iloc[rows, cols].reset_index(drop=True)
 
 # ---------------------------------------------------------------------
 # Brick rendering bits
 # ---------------------------------------------------------------------
+_PILL_TMPL  = "<span class='pill pill-{kind}'{title}>{txt}</span>"
+_BADGE_TMPL = "<span class='badge badge-{kind}'>{txt}</span>"
+_CARD_TMPL  = """
+<div class='card-outer card-{kind}-bg'>
+  <div class='card-title'>{title} {status_badge}</div>
+  <div class='sep'></div>
+  <div>{body_html}</div>
+</div>
+"""
+_KINDS = frozenset({"allowed", "possible", "na", "oagvc"})
+
+def _pill(kind, txt, title):
+    t = f' title="{escape(title)}"' if title else ""
+    return _PILL_TMPL.format_map({"kind": kind, "title": t, "txt": txt})
+
 def pill_ok(txt, title=None):
-    t = f' title="{title}"' if title else ""
-    return f"<span class='pill pill-ok'{t}>{txt}</span>"
+    return _pill("ok", txt, title)
 
 def pill_need(txt, title=None):
-    t = f' title="{title}"' if title else ""
-    return f"<span class='pill pill-need'{t}>{txt}</span>"
+    return _pill("need", txt, title)
 
 def pill_info(txt, title=None):
-    t = f' title="{title}"' if title else ""
-    return f"<span class='pill pill-info'{t}>{txt}</span>"
+    return _pill("info", txt, title)
 
 def badge(txt, kind="possible"):
-    cls = {
-        "allowed": "badge badge-allowed",
-        "possible": "badge badge-possible",
-        "na": "badge badge-na",
-        "oagvc": "badge badge-oagvc",
-    }[kind]
-    return f"<span class='{cls}'>{txt}</span>"
+    if kind not in _KINDS:
+        raise KeyError(kind)
+    return _BADGE_TMPL.format_map({"kind": kind, "txt": txt})
 
 def card(title, status_badge, body_html, kind="possible"):
-    bg = {
-        "allowed": "card-allowed-bg",
-        "possible": "card-possible-bg",
-        "na": "card-na-bg",
-        "oagvc": "card-oagvc-bg",
-    }[kind]
-    return f"""
-<div class='card-outer {bg}'>
-  <div class='card-title'>{title} {status_badge}</div>
-  <div class='sep'></div>
-  <div>{body_html}</div>
-</div>
-"""
-
-def yesish(val: str) -> bool:
-    return str(val).strip().lower() in {"yes", "true", "1", "ok"}
+    if kind not in _KINDS:
+        raise KeyError(kind)
+    return _CARD_TMPL.format_map(
+        {"kind": kind, "title": title, "status_badge": status_badge, "body_html": body_html}
+    )
 
 # ---------------------------------------------------------------------
 # Regulatory helpers + rules text
@@ -240,36 +343,40 @@ def _parse_mtow_g(row) -> float | None:
     try:
         return float(s)
     except Exception:
-        import re
         m = re.search(r"([\d\.]+)", s)
         return float(m.group(1)) if m else None
 
-def rule_text_a1():
-    return (
-        "Fly close to people; avoid assemblies/crowds. TOAL: sensible separation; "
-        "follow local restrictions."
-    )
+RULE_TEXT_A1 = (
+    "Fly close to people; avoid assemblies/crowds. TOAL: sensible separation; "
+    "follow local restrictions."
+)
+RULE_TEXT_A2_TRANSITIONAL = (
+    "A2 mainly for C2 drones (sometimes C1 by nuance). Transitional (≤2 kg) "
+    "until Jan 2026: keep ≥50 m from uninvolved people."
+)
+RULE_TEXT_A2 = "C2/UK2: keep 30 m from uninvolved people (5 m in low-speed)."
+RULE_TEXT_A3 = (
+    "Keep ≥150 m from residential/commercial/industrial/recreational areas. "
+    "TOAL: well away from uninvolved people and built-up areas."
+)
+RULE_TEXT_SPECIFIC = (
+    "Risk-assessed operations per OA; distances per ops manual. TOAL & "
+    "mitigations defined by your approved procedures (e.g., PDRA-01: ≥50 m in "
+    "flight; TOAL may be reduced to 30 m; no overflight of assemblies)."
+)
 
 def rule_text_a2(year: int):
-    if year < 2026:
-        return (
-            "A2 mainly for C2 drones (sometimes C1 by nuance). Transitional (≤2 kg) "
-            "until Jan 2026: keep ≥50 m from uninvolved people."
-        )
-    return "C2/UK2: keep 30 m from uninvolved people (5 m in low-speed)."
-
-def rule_text_a3():
-    return (
-        "Keep ≥150 m from residential/commercial/industrial/recreational areas. "
-        "TOAL: well away from uninvolved people and built-up areas."
-    )
-
-def rule_text_specific():
-    return (
-        "Risk-assessed operations per OA; distances per ops manual. TOAL & "
-        "mitigations defined by your approved procedures (e.g., PDRA-01: ≥50 m in "
-        "flight; TOAL may be reduced to 30 m; no overflight of assemblies)."
-    )
+    return RULE_TEXT_A2_TRANSITIONAL if year < 2026 else RULE_TEXT_A2
+
+# Fixed pills, built once instead of per brick per era
+PILL_OP_OK    = pill_ok("Operator ID: OK")
+PILL_OP_NEED  = pill_need("Operator ID: Required")
+PILL_OP_NONE  = pill_ok("Operator ID: Not required")
+PILL_FL_OK    = pill_ok("Flyer ID: OK")
+PILL_FL_NEED  = pill_need("Flyer ID: Required")
+PILL_FL_NONE  = pill_ok("Flyer ID: Not required")
+PILL_GEO_OK   = pill_ok("Geo-awareness: Onboard")
+PILL_GEO_NEED = pill_need("Geo-awareness: Required")
 
 def eligible_open_subcats(row: pd.Series, year: int, jurisdiction: str = "UK") -> dict:
     eu = _lc(row.get("eu_class_marking", ""))
@@ -306,7 +413,7 @@ def eligible_open_subcats(row: pd.Series, year: int, jurisdiction: str = "UK") -
     return {"a1": a1, "a2": a2, "a3": a3}
 
 def rid_is_required(row: pd.Series, year: int, jurisdiction: str = "UK") -> bool:
-    has_cam = yesish(row.get("has_camera", "yes"))
+    has_cam = bool(row["has_camera_bool"])
     eu = _lc(row.get("eu_class_marking", ""))
     uk = _lc(row.get("uk_class_marking", ""))
     mtow = _parse_mtow_g(row) or 0.0
@@ -328,72 +435,42 @@ def rid_pill(row: pd.Series, year: int, rid_ok: bool, jurisdiction: str = "UK")
 def pills_all_ok(pills: list[str]) -> bool:
     return all("pill-need" not in p for p in pills)
 
-# --- kinds only (for report & counting) --------------------------------
-def _kinds_for(row: pd.Series, creds: dict, year: int, jurisdiction: str = "UK") -> dict:
-    """Return {'A1': kind, 'A2': kind, 'A3': kind, 'Specific': kind} where kind is 'allowed'|'possible'|'na'|'oagvc'."""
-    has_cam = yesish(row.get("has_camera", "yes"))
-    geo_ok  = yesish(row.get("geo_awareness", "unknown"))
-    rid_ok  = yesish(row.get("remote_id_builtin", "unknown"))
-    elig    = eligible_open_subcats(row, year, jurisdiction)
+# --- kinds only (report page: _rule_facts -> _kinds_from_facts) ---------
+# Credential-independent facts per drone/year; kinds follow from these + creds
+RULE_FACTS = ("a1", "a2", "a3", "device_gap", "a1_needs_ids")
 
-    have_op, have_fl = creds.get("op", False), creds.get("flyer", False)
-    have_a2, have_gvc, have_oa = creds.get("a2", False), creds.get("gvc", False), creds.get("oa", False)
-    mtow = _parse_mtow_g(row) or 0.0
-    sub100 = mtow < 100
-
-    kinds = {}
-
-    # A1
-    if not elig["a1"]:
-        kinds["A1"] = "na"
-    else:
-        pills = []
-        if has_cam and not sub100 and not have_op: pills.append(pill_need("x"))
-        if has_cam and not sub100 and not have_fl: pills.append(pill_need("x"))
-        pills.append(rid_pill(row, year, rid_ok, jurisdiction))
-        if not geo_ok: pills.append(pill_need("x"))
-        kinds["A1"] = "allowed" if pills_all_ok(pills) else "possible"
+def _rule_facts(row: pd.Series, year: int, jurisdiction: str = "UK") -> tuple:
+    has_cam = bool(row["has_camera_bool"])
+    geo_ok  = bool(row["geo_awareness_bool"])
+    rid_ok  = bool(row["remote_id_builtin_bool"])
+    elig    = eligible_open_subcats(row, year, jurisdiction)
+    mtow    = _parse_mtow_g(row) or 0.0
+    sub100  = mtow < 100
 
-    # A2
-    if not elig["a2"]:
-        kinds["A2"] = "na"
-    else:
-        pills = []
-        if not have_op: pills.append(pill_need("x"))
-        if not have_fl: pills.append(pill_need("x"))
-        if not have_a2: pills.append(pill_need("x"))
-        pills.append(rid_pill(row, year, rid_ok, jurisdiction))
-        if not geo_ok: pills.append(pill_need("x"))
-        kinds["A2"] = "allowed" if pills_all_ok(pills) else "possible"
+    # Same gaps compute_bricks turns into "Required" pills
+    device_gap = (rid_is_required(row, year, jurisdiction) and not rid_ok) or not geo_ok
+    return (elig["a1"], elig["a2"], elig["a3"], device_gap, has_cam and not sub100)
 
-    # A3
-    if not elig["a3"]:
-        kinds["A3"] = "na"
-    else:
-        pills = []
-        if not have_op: pills.append(pill_need("x"))
-        if not have_fl: pills.append(pill_need("x"))
-        pills.append(rid_pill(row, year, rid_ok, jurisdiction))
-        if not geo_ok: pills.append(pill_need("x"))
-        kinds["A3"] = "allowed" if pills_all_ok(pills) else "possible"
+def _kinds_from_facts(facts, creds: dict) -> dict:
+    """Vectorised over a bool array whose last axis follows RULE_FACTS."""
+    a1, a2, a3, device_gap, a1_needs_ids = np.moveaxis(np.asarray(facts, dtype=bool), -1, 0)
 
-    # Specific
-    pills = []
-    if not have_op: pills.append(pill_need("x"))
-    if not have_fl: pills.append(pill_need("x"))
-    if not have_gvc: pills.append(pill_need("x"))
-    if not have_oa: pills.append(pill_need("x"))
-    pills.append(rid_pill(row, year, rid_ok, jurisdiction))
-    if not geo_ok: pills.append(pill_need("x"))
-    kinds["Specific"] = "allowed" if pills_all_ok(pills) else "oagvc"
+    have_op, have_fl = creds.get("op", False), creds.get("flyer", False)
+    have_a2, have_gvc, have_oa = creds.get("a2", False), creds.get("gvc", False), creds.get("oa", False)
+    ids_gap = not (have_op and have_fl)
 
-    return kinds
+    return {
+        "A1": np.where(a1, np.where(device_gap | (a1_needs_ids & ids_gap), "possible", "allowed"), "na"),
+        "A2": np.where(a2, np.where(device_gap | (ids_gap or not have_a2), "possible", "allowed"), "na"),
+        "A3": np.where(a3, np.where(device_gap | ids_gap, "possible", "allowed"), "na"),
+        "Specific": np.where(device_gap | (ids_gap or not (have_gvc and have_oa)), "oagvc", "allowed"),
+    }
 
 # --- HTML bricks (product page) ----------------------------------------
 def compute_bricks(row: pd.Series, creds: dict, year: int, jurisdiction: str = "UK"):
-    has_cam = yesish(row.get("has_camera", "yes"))
-    geo_ok  = yesish(row.get("geo_awareness", "unknown"))
-    rid_ok  = yesish(row.get("remote_id_builtin", "unknown"))
+    has_cam = bool(row["has_camera_bool"])
+    geo_ok  = bool(row["geo_awareness_bool"])
+    rid_ok  = bool(row["remote_id_builtin_bool"])
 
     elig = eligible_open_subcats(row, year, jurisdiction)
 
@@ -411,26 +488,26 @@ def compute_bricks(row: pd.Series, creds: dict, year: int, jurisdiction: str = "
         html_a1 = card(
             "A1 — Close to people",
             badge("Not applicable", "na"),
-            f"<div class='small'>{rule_text_a1()}</div>"
+            f"<div class='small'>{RULE_TEXT_A1}</div>"
             f"<div>{pill_info('Not eligible by class/weight')}</div>",
             "na",
         )
     else:
         pills_a1 = []
         if has_cam and not sub100 and not have_op:
-            pills_a1.append(pill_need("Operator ID: Required"))
+            pills_a1.append(PILL_OP_NEED)
         else:
-            pills_a1.append(pill_ok("Operator ID: OK" if not sub100 else "Operator ID: Not required"))
+            pills_a1.append(PILL_OP_OK if not sub100 else PILL_OP_NONE)
         if has_cam and not sub100 and not have_fl:
-            pills_a1.append(pill_need("Flyer ID: Required"))
+            pills_a1.append(PILL_FL_NEED)
         else:
-            pills_a1.append(pill_ok("Flyer ID: OK" if not sub100 else "Flyer ID: Not required"))
+            pills_a1.append(PILL_FL_OK if not sub100 else PILL_FL_NONE)
         pills_a1.append(rid_pill(row, year, rid_ok, jurisdiction))
-        pills_a1.append(pill_ok("Geo-awareness: Onboard") if geo_ok else pill_need("Geo-awareness: Required"))
+        pills_a1.append(PILL_GEO_OK if geo_ok else PILL_GEO_NEED)
 
         a1_kind   = "allowed" if pills_all_ok(pills_a1) else "possible"
         a1_badge  = badge("Allowed" if a1_kind == "allowed" else "Possible (additional requirements)", a1_kind)
-        a1_body   = f"<div class='small'>{rule_text_a1()}</div><div>{''.join(pills_a1)}</div>"
+        a1_body   = f"<div class='small'>{RULE_TEXT_A1}</div><div>{''.join(pills_a1)}</div>"
         html_a1   = card("A1 — Close to people", a1_badge, a1_body, a1_kind)
 
     # A2
@@ -444,11 +521,11 @@ def compute_bricks(row: pd.Series, creds: dict, year: int, jurisdiction: str = "
         )
     else:
         pills_a2 = []
-        pills_a2.append(pill_need("Operator ID: Required") if not have_op else pill_ok("Operator ID: OK"))
-        pills_a2.append(pill_need("Flyer ID: Required") if not have_fl else pill_ok("Flyer ID: OK"))
+        pills_a2.append(PILL_OP_NEED if not have_op else PILL_OP_OK)
+        pills_a2.append(PILL_FL_NEED if not have_fl else PILL_FL_OK)
         pills_a2.append(pill_need("A2 CofC: Required") if not have_a2 else pill_ok("A2 CofC: OK"))
         pills_a2.append(rid_pill(row, year, rid_ok, jurisdiction))
-        pills_a2.append(pill_ok("Geo-awareness: Onboard") if geo_ok else pill_need("Geo-awareness: Required"))
+        pills_a2.append(PILL_GEO_OK if geo_ok else PILL_GEO_NEED)
 
         a2_kind   = "allowed" if pills_all_ok(pills_a2) else "possible"
         a2_badge  = badge("Allowed" if a2_kind == "allowed" else "Possible (additional requirements)", a2_kind)
@@ -460,71 +537,144 @@ def compute_bricks(row: pd.Series, creds: dict, year: int, jurisdiction: str = "
         html_a3 = card(
             "A3 — Far from people",
             badge("Not applicable", "na"),
-            f"<div class='small'>{rule_text_a3()}</div>"
+            f"<div class='small'>{RULE_TEXT_A3}</div>"
             f"<div>{pill_info('Not eligible by class/weight for A3')}</div>",
             "na",
         )
     else:
         pills_a3 = []
-        pills_a3.append(pill_need("Operator ID: Required") if not have_op else pill_ok("Operator ID: OK"))
-        pills_a3.append(pill_need("Flyer ID: Required") if not have_fl else pill_ok("Flyer ID: OK"))
+        pills_a3.append(PILL_OP_NEED if not have_op else PILL_OP_OK)
+        pills_a3.append(PILL_FL_NEED if not have_fl else PILL_FL_OK)
         pills_a3.append(rid_pill(row, year, rid_ok, jurisdiction))
-        pills_a3.append(pill_ok("Geo-awareness: Onboard") if geo_ok else pill_need("Geo-awareness: Required"))
+        pills_a3.append(PILL_GEO_OK if geo_ok else PILL_GEO_NEED)
 
         a3_kind   = "allowed" if pills_all_ok(pills_a3) else "possible"
         a3_badge  = badge("Allowed" if a3_kind == "allowed" else "Possible (additional requirements)", a3_kind)
-        a3_body   = f"<div class='small'>{rule_text_a3()}</div><div>{''.join(pills_a3)}</div>"
+        a3_body   = f"<div class='small'>{RULE_TEXT_A3}</div><div>{''.join(pills_a3)}</div>"
         html_a3   = card("A3 — Far from people", a3_badge, a3_body, a3_kind)
 
     # Specific
     pills_sp = []
-    pills_sp.append(pill_need("Operator ID: Required") if not have_op else pill_ok("Operator ID: OK"))
-    pills_sp.append(pill_need("Flyer ID: Required")   if not have_fl else pill_ok("Flyer ID: OK"))
-    pills_sp.append(pill_need("GVC: Required")        if not have_gvc else pill_ok("GVC: OK"))
-    pills_sp.append(pill_need("OA: Required")         if not have_oa else pill_ok("OA: OK"))
+    pills_sp.append(PILL_OP_NEED if not have_op else PILL_OP_OK)
+    pills_sp.append(PILL_FL_NEED if not have_fl else PILL_FL_OK)
+    pills_sp.append(pill_need("GVC: Required") if not have_gvc else pill_ok("GVC: OK"))
+    pills_sp.append(pill_need("OA: Required")  if not have_oa else pill_ok("OA: OK"))
     pills_sp.append(rid_pill(row, year, rid_ok, jurisdiction))
-    pills_sp.append(pill_ok("Geo-awareness: Onboard") if geo_ok else pill_need("Geo-awareness: Required"))
+    pills_sp.append(PILL_GEO_OK if geo_ok else PILL_GEO_NEED)
 
     sp_kind   = "allowed" if pills_all_ok(pills_sp) else "oagvc"
     sp_lbl    = "Allowed" if sp_kind == "allowed" else "Available via OA/GVC"
     sp_badge  = badge(sp_lbl, "allowed" if sp_kind == "allowed" else "oagvc")
-    sp_body   = f"<div class='small'>{rule_text_specific()}</div><div>{''.join(pills_sp)}</div>"
+    sp_body   = f"<div class='small'>{RULE_TEXT_SPECIFIC}</div><div>{''.join(pills_sp)}</div>"
     html_sp   = card("Specific — OA / GVC", sp_badge, sp_body, sp_kind)
 
     return html_a1, html_a2, html_a3, html_sp
 
+# --- product page grid -------------------------------------------------
+# Year columns shared by the product grid and the report page
+ERAS = (
+    (2025, "Now – 31 Dec 2025"),
+    (2026, "1 Jan 2026 – 31 Dec 2027 (UK–EU bridge)"),
+    (2028, "From 1 Jan 2028 (planned)"),
+)
+
+_GRID_HEAD = "<div class='grid3 divided' style='margin:0 0 8px 0;'>%s</div>"
+_GRID_HEAD_CELL = "<div style='text-align:left;font-weight:600;font-size:.95rem;color:#374151;margin-bottom:4px;'>%s</div>"
+_GRID_ROW = "<div class='grid3 divided'>%s</div>"
+_GRID_CELL = "<div>%s</div>"
+
+def compliance_grid_html(row: pd.Series, creds: dict, jurisdiction: str = "UK") -> str:
+    """Header row, then A1 / A2 / A3 / Specific rows, each spanning the ERAS columns."""
+    per_era = [compute_bricks(row, creds, yr, jurisdiction) for yr, _ in ERAS]
+    head = _GRID_HEAD % "".join(_GRID_HEAD_CELL % title for _, title in ERAS)
+    rows = [_GRID_ROW % "".join(_GRID_CELL % bricks[i] for bricks in per_era) for i in range(4)]
+    return head + "".join(rows)
+
+CRED_KEYS = ("op", "flyer", "a2", "gvc", "oa")
+
+@st.cache_data(show_spinner=False)
+def compliance_grid_cached(model_key: str, creds: tuple, jurisdiction: str = "UK") -> str:
+    """compliance_grid_html per model, keyed by the CRED_KEYS-ordered credential flags."""
+    row = lookup["records"][lookup["by_model"][model_key]]
+    return compliance_grid_html(row, dict(zip(CRED_KEYS, creds)), jurisdiction)
+
 # ---------------------------------------------------------------------
 # Landing/series helpers
 # ---------------------------------------------------------------------
-SEGMENT_HERO = {
-    "consumer": resolve_img("images/consumer.jpg"),
-    "pro": resolve_img("images/professional.jpg"),
-    "enterprise": resolve_img("images/enterprise.jpg"),
-}
-WHAT_IMG = resolve_img("images/mini_mavic.jpg")  # any neutral image you have
+# Fixed image URLs, resolved once per process rather than on every script run
+@st.cache_resource(show_spinner=False)
+def _static_images():
+    segment_hero = {
+        "consumer": resolve_img("images/consumer.jpg"),
+        "pro": resolve_img("images/professional.jpg"),
+        "enterprise": resolve_img("images/enterprise.jpg"),
+    }
+    what_img = resolve_img("images/mini_mavic.jpg")  # any neutral image you have
+    return segment_hero, what_img, resolve_img("images/eu.png"), resolve_img("images/uk.png")
+
+SEGMENT_HERO, WHAT_IMG, EU_FLAG, UK_FLAG = _static_images()
+
+_CARD_A_OPEN = (
+    "<a href='?%s' target='_self' rel='noopener' "
+    "style='display:block;width:260px;height:240px;border:1px solid #E5E7EB;border-radius:14px;background:#fff;padding:12px;text-decoration:none;color:#111827;transition:.15s ease;cursor:pointer'>"
+)
+_CARD_TITLE = "<div style='margin-top:10px;text-align:center;font-weight:700;font-size:.98rem'>%s</div>%s</a>"
+_CARD_TMPL_IMG = (
+    _CARD_A_OPEN
+    + "<div style='width:260px;height:150px;border-radius:10px;background:#F3F4F6;overflow:hidden;display:flex;align-items:center;justify-content:center'><img src='%s' loading='lazy' decoding='async' width='260' height='150' style='width:100%%;height:100%%;object-fit:cover' /></div>"
+    + _CARD_TITLE
+)
+_CARD_TMPL_NOIMG = (
+    _CARD_A_OPEN
+    + "<div style='width:260px;height:150px;border-radius:10px;background:#F3F4F6'></div>"
+    + _CARD_TITLE
+)
+_CARD_SUB = "<div style='margin-top:4px;text-align:center;font-size:.8rem;color:#6B7280'>%s</div>"
 
 def card_link(qs: str, title: str, sub: str = "", img_url: str = "") -> str:
-    img = (
-        f"<div style='width:260px;height:150px;border-radius:10px;background:#F3F4F6;overflow:hidden;display:flex;align-items:center;justify-content:center'><img src='{img_url}' style='width:100%;height:100%;object-fit:cover' /></div>"
-        if img_url else "<div style='width:260px;height:150px;border-radius:10px;background:#F3F4F6'></div>"
-    )
-    sub_html = f"<div style='margin-top:4px;text-align:center;font-size:.8rem;color:#6B7280'>{sub}</div>" if sub else ""
-    return (
-        f"<a href='?{qs}' target='_self' rel='noopener' "
-        f"style='display:block;width:260px;height:240px;border:1px solid #E5E7EB;border-radius:14px;background:#fff;padding:12px;text-decoration:none;color:#111827;transition:.15s ease;cursor:pointer'>"
-        f"{img}<div style='margin-top:10px;text-align:center;font-weight:700;font-size:.98rem'>{title}</div>{sub_html}</a>"
-    )
+    # title/sub come from the dataset/taxonomy, so escape them
+    sub_html = _CARD_SUB % escape(sub) if sub else ""
+    if img_url:
+        return _CARD_TMPL_IMG % (qs, img_url, escape(str(title)), sub_html)
+    return _CARD_TMPL_NOIMG % (qs, escape(str(title)), sub_html)
+
+_ROW_TMPL = (
+    "<div class='h1'>%s</div>"
+    "<div style='display:flex;gap:14px;overflow-x:auto;padding:8px 2px'>%s</div>"
+)
 
 def render_row(title: str, items: list[str]):
-    st.markdown(
-        f"<div class='h1'>{title}</div>"
-        f"<div style='display:flex;gap:14px;overflow-x:auto;padding:8px 2px'>{''.join(items)}</div>",
-        unsafe_allow_html=True,
+    st.markdown(_ROW_TMPL % (title, "".join(items)), unsafe_allow_html=True)
+
+@st.cache_resource(show_spinner=False)
+def landing_html() -> str:
+    """Category cards + report card; the same for every visitor, so built once."""
+    taxonomy, _ = load_taxonomy()
+    items = [
+        card_link(f"segment={seg['key']}", seg["label"], img_url=SEGMENT_HERO.get(seg["key"], ""))
+        for seg in taxonomy["segments"]
+    ]
+    items.append(
+        card_link(
+            "page=report",
+            "What/where can I fly?",
+            sub="Tell us your credentials and we’ll scan all drones by year.",
+            img_url=WHAT_IMG,
+        )
     )
+    return _ROW_TMPL % ("Choose your drone category", "".join(items))
 
 # ---------------------------------------------------------------------
 # REPORT PAGE
 # ---------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def report_facts():
+    """RULE_FACTS for every drone in every ERAS year, shaped (drones, eras, facts)."""
+    return np.array(
+        [[_rule_facts(r, yr) for yr, _ in ERAS] for _, r in df.iterrows()],
+        dtype=bool,
+    )
+
 def render_report_page():
     st.markdown("<div class='report-head'>What/where can I fly?</div>", unsafe_allow_html=True)
     st.markdown("Tell us what credentials you hold; we’ll check **all drones** in the list and show what’s **Allowed** by year.", unsafe_allow_html=True)
@@ -548,29 +698,91 @@ def render_report_page():
 
     cat_on = {"A1": fa1, "A2": fa2, "A3": fa3, "Specific": fsp}
 
+    # Whole fleet at once; only the creds vary between reruns
+    kinds = _kinds_from_facts(report_facts(), creds)
+    allowed = {c: kinds[c] == "allowed" for c in kinds if cat_on.get(c, True)}
+    names = df["marketing_name"].tolist()
+
     # Three year columns with dynamic counts
-    c_now, c_2627, c_28 = st.columns(3)
-    cols = [(c_now, 2025, "Now – 31 Dec 2025"),
-            (c_2627, 2026, "1 Jan 2026 – 31 Dec 2027 (UK–EU bridge)"),
-            (c_28, 2028, "From 1 Jan 2028 (planned)")]
-
-    for col, yr, title in cols:
-        # Compute list once to derive count, then render
-        matches = []
-        for _, r in df.iterrows():
-            kinds = _kinds_for(r, creds, yr)
-            allowed_cats = [k for k, v in kinds.items() if v == "allowed" and cat_on.get(k, True)]
-            if allowed_cats:
-                matches.append((r, allowed_cats))
+    for e, (col, (yr, title)) in enumerate(zip(st.columns(len(ERAS)), ERAS)):
+        hit = np.zeros(len(names), dtype=bool)
+        for mask in allowed.values():
+            hit |= mask[:, e]
+        matches = np.flatnonzero(hit)
 
         with col:
             st.markdown(f"### {title} <span class='count-bubble'>{len(matches)}</span>", unsafe_allow_html=True)
-            for r, cats in matches:
-                chips = " ".join([f"<span class='cat-pill'>{c}</span>" for c in cats])
-                st.markdown(
-                    f"<div class='cat-chip'>{r.get('marketing_name','')} {chips}</div>",
-                    unsafe_allow_html=True
-                )
+            # One element per column; each chip keeps its own line
+            rows_html = []
+            for i in matches:
+                chips = " ".join([f"<span class='cat-pill'>{c}</span>" for c, mask in allowed.items() if mask[i, e]])
+                rows_html.append(f"<div><div class='cat-chip'>{escape(str(names[i]))} {chips}</div></div>")
+            if rows_html:
+                st.markdown("".join(rows_html), unsafe_allow_html=True)
+
+# ---------------------------------------------------------------------
+# PRODUCT PAGE
+# ---------------------------------------------------------------------
+SIDEBAR_LEGEND = (
+    "<div class='legend'>"
+    f"{badge('Allowed','allowed')} "
+    f"{badge('Possible (additional requirements)','possible')} "
+    f"{badge('Available via OA/GVC','oagvc')}"
+    "</div>"
+)
+# Thumbnail, flags and key specs: one read-only block, flag URLs baked in
+_SIDEBAR_THUMB = "<div class='sidebar-thumb'><img src='{img}'/><div>{name}</div></div>"
+_SIDEBAR_SPECS = (
+    f"<div class='flagline'><img src=\"{EU_FLAG}\"/><div><b>EU:</b> {{eu}}</div></div>"
+    f"<div class='flagline'><img src=\"{UK_FLAG}\"/><div><b>UK:</b> {{uk}}</div></div>"
+    "<div class='sidebar-title'>Key specs</div>"
+    "<div class='sidebar-kv'><b>Model</b>: {model}</div>"
+    "<div class='sidebar-kv'><b>MTOW</b>: {mtow} g</div>"
+    "<div class='sidebar-kv'><b>Remote ID</b>: {rid}</div>"
+    "<div class='sidebar-kv'><b>Geo-awareness</b>: {geo}</div>"
+    "<div class='sidebar-kv'><b>Released</b>: {released}</div>"
+)
+
+def _sidebar_block(row: dict) -> str:
+    # Every value comes from the dataset, so all of them are escaped
+    img_url = row.get("resolved_image_url", "")
+    thumb = _SIDEBAR_THUMB.format_map(
+        {"img": escape(str(img_url)), "name": escape(str(row.get("marketing_name", "")))}
+    ) if img_url else ""
+    return thumb + _SIDEBAR_SPECS.format_map({
+        k: escape(str(row.get(col, default)))
+        for k, col, default in (
+            ("eu", "eu_class_marking", "unknown"),
+            ("uk", "uk_class_marking", "unknown"),
+            ("model", "marketing_name", "—"),
+            ("mtow", "mtom_g_nominal", "—"),
+            ("rid", "remote_id_builtin", "unknown"),
+            ("geo", "geo_awareness", "unknown"),
+            ("released", "year_released", "—"),
+        )
+    })
+
+@st.cache_resource(show_spinner=False)
+def sidebar_html() -> list[str]:
+    """Read-only sidebar block per row position; it only depends on the row."""
+    return [_sidebar_block(r) for r in lookup["records"]]
+
+@st.fragment
+def render_creds_and_grid(row: dict):
+    # Credentials (compact) + legend
+    st.sidebar.markdown("<div class='sidebar-title' style='margin-top:.7rem'>Your credentials</div>", unsafe_allow_html=True)
+    have_op   = st.sidebar.checkbox("Operator ID", value=False, key="c_op")
+    have_fl   = st.sidebar.checkbox("Flyer ID", value=False, key="c_fl")
+    have_a2   = st.sidebar.checkbox("A2 CofC", value=False, key="c_a2")
+    have_gvc  = st.sidebar.checkbox("GVC", value=False, key="c_gvc")
+    have_oa   = st.sidebar.checkbox("OA (Operational Authorisation)", value=False, key="c_oa")
+
+    st.sidebar.markdown(SIDEBAR_LEGEND, unsafe_allow_html=True)
+
+    creds = (have_op, have_fl, have_a2, have_gvc, have_oa)  # CRED_KEYS order
+
+    # --------- Compliance grid (UK by default) ---------
+    st.markdown(compliance_grid_cached(row["model_key"], creds, jurisdiction="UK"), unsafe_allow_html=True)
 
 # ---------------------------------------------------------------------
 # PAGE FLOW
@@ -580,178 +792,57 @@ if page == "report":
     render_report_page()
 
 elif not segment:
-    # Landing page: choose group + report card
-    items = []
-    for seg in taxonomy["segments"]:
-        img = SEGMENT_HERO.get(seg["key"], "")
-        items.append(card_link(f"segment={seg['key']}", seg["label"], img_url=img))
-    # Add the report card (only on landing)
-    items.append(
-        card_link(
-            "page=report",
-            "What/where can I fly?",
-            sub="Tell us your credentials and we’ll scan all drones by year.",
-            img_url=WHAT_IMG,
-        )
-    )
-    render_row("Choose your drone category", items)
+    # Landing page: choose group + report card (prebuilt)
+    st.markdown(landing_html(), unsafe_allow_html=True)
 
 elif not series:
     # Series page (no sidebar, no report card)
-    seg_label = next(s["label"] for s in taxonomy["segments"] if s["key"] == segment)
-    items = []
-    for s in series_defs_for(segment):
-        items.append(
-            card_link(
-                f"segment={segment}&series={s['key']}",
-                s["label"],
-                img_url=random_image_for_series(segment, s["key"]),
-            )
+    _, tax_lookup = load_taxonomy()
+    seg_label = tax_lookup["segments_by_key"][segment]["label"]
+    items = [
+        card_link(
+            f"segment={segment}&series={s['key']}",
+            s["label"],
+            img_url=random_image_for_series(segment, s["key"]),
         )
+        for s in series_defs_for(segment)
+    ]
     render_row(f"Choose a series ({seg_label})", items)
 
 else:
     # Product page (sidebar visible)
-    seg_label = next(s["label"] for s in taxonomy["segments"] if s["key"] == segment)
-    ser_label = next(s["label"] for s in series_defs_for(segment) if s["key"] == series)
+    _, tax_lookup = load_taxonomy()
+    seg_label = tax_lookup["segments_by_key"][segment]["label"]
+    ser_label = tax_lookup["series_by_key"][(segment, series)]["label"]
 
-    sel = df[df["model_key"] == model] if model else None
+    pos = lookup["by_model"].get(model) if model else None
 
-    if sel is not None and not sel.empty:
-        row = sel.iloc[0]
+    if pos is not None:
+        row = lookup["records"][pos]
 
         # --- Sidebar (only on product page) ---
         st.sidebar.markdown("### Navigation")
         if st.sidebar.button("Restart"):
             _restart_app()
 
-        img_url = resolve_img(row.get("image_url", ""))
-        if img_url:
-            st.sidebar.image(img_url, use_container_width=True, caption=row.get("marketing_name", ""))
-
-        # Flags & classes
-        eu_flag = resolve_img("images/eu.png")
-        uk_flag = resolve_img("images/uk.png")
-        eu_cls  = row.get("eu_class_marking", "unknown")
-        uk_cls  = row.get("uk_class_marking", "unknown")
-        st.sidebar.markdown(
-            f"""
-<div class='flagline'><img src="{eu_flag}"/><div><b>EU:</b> {eu_cls}</div></div>
-<div class='flagline'><img src="{uk_flag}"/><div><b>UK:</b> {uk_cls}</div></div>
-""",
-            unsafe_allow_html=True,
-        )
-
-        st.sidebar.markdown("<div class='sidebar-title'>Key specs</div>", unsafe_allow_html=True)
-        st.sidebar.markdown(
-            f"<div class='sidebar-kv'><b>Model</b>: {row.get('marketing_name','—')}</div>"
-            f"<div class='sidebar-kv'><b>MTOW</b>: {row.get('mtom_g_nominal','—')} g</div>"
-            f"<div class='sidebar-kv'><b>Remote ID</b>: {row.get('remote_id_builtin','unknown')}</div>"
-            f"<div class='sidebar-kv'><b>Geo-awareness</b>: {row.get('geo_awareness','unknown')}</div>"
-            f"<div class='sidebar-kv'><b>Released</b>: {row.get('year_released','—')}</div>",
-            unsafe_allow_html=True,
-        )
-
-        # Credentials (compact) + legend
-        st.sidebar.markdown("<div class='sidebar-title' style='margin-top:.7rem'>Your credentials</div>", unsafe_allow_html=True)
-        have_op   = st.sidebar.checkbox("Operator ID", value=False, key="c_op")
-        have_fl   = st.sidebar.checkbox("Flyer ID", value=False, key="c_fl")
-        have_a2   = st.sidebar.checkbox("A2 CofC", value=False, key="c_a2")
-        have_gvc  = st.sidebar.checkbox("GVC", value=False, key="c_gvc")
-        have_oa   = st.sidebar.checkbox("OA (Operational Authorisation)", value=False, key="c_oa")
-
-        st.sidebar.markdown(
-            "<div class='legend'>"
-            f"{badge('Allowed','allowed')} "
-            f"{badge('Possible (additional requirements)','possible')} "
-            f"{badge('Available via OA/GVC','oagvc')}"
-            "</div>",
-            unsafe_allow_html=True,
-        )
+        st.sidebar.markdown(sidebar_html()[pos], unsafe_allow_html=True)
 
-        creds = dict(op=have_op, flyer=have_fl, a2=have_a2, gvc=have_gvc, oa=have_oa)
-
-        # --------- Compute all bricks (UK by default) ---------
-        a_now = compute_bricks(row, creds, 2025, jurisdiction="UK")
-        a_26  = compute_bricks(row, creds, 2026, jurisdiction="UK")
-        a_28  = compute_bricks(row, creds, 2028, jurisdiction="UK")
-
-        # ---------- HEADERS ----------
-        st.markdown(
-            "<div class='grid3 divided' style='margin:0 0 8px 0;'>"
-            "<div style='text-align:left;font-weight:600;font-size:.95rem;color:#374151;margin-bottom:4px;'>"
-            "Now – 31 Dec 2025"
-            "</div>"
-            "<div style='text-align:left;font-weight:600;font-size:.95rem;color:#374151;margin-bottom:4px;'>"
-            "1 Jan 2026 – 31 Dec 2027 (UK–EU bridge)"
-            "</div>"
-            "<div style='text-align:left;font-weight:600;font-size:.95rem;color:#374151;margin-bottom:4px;'>"
-            "From 1 Jan 2028 (planned)"
-            "</div>"
-            "</div>",
-            unsafe_allow_html=True,
-        )
-
-        # Row 1: A1 across 3 cells
-        st.markdown(
-            "<div class='grid3 divided'>"
-            f"<div>{a_now[0]}</div>"
-            f"<div>{a_26[0]}</div>"
-            f"<div>{a_28[0]}</div>"
-            "</div>",
-            unsafe_allow_html=True,
-        )
-        # Row 2: A2
-        st.markdown(
-            "<div class='grid3 divided'>"
-            f"<div>{a_now[1]}</div>"
-            f"<div>{a_26[1]}</div>"
-            f"<div>{a_28[1]}</div>"
-            "</div>",
-            unsafe_allow_html=True,
-        )
-        # Row 3: A3
-        st.markdown(
-            "<div class='grid3 divided'>"
-            f"<div>{a_now[2]}</div>"
-            f"<div>{a_26[2]}</div>"
-            f"<div>{a_28[2]}</div>"
-            "</div>",
-            unsafe_allow_html=True,
-        )
-        # Row 4: Specific
-        st.markdown(
-            "<div class='grid3 divided'>"
-            f"<div>{a_now[3]}</div>"
-            f"<div>{a_26[3]}</div>"
-            f"<div>{a_28[3]}</div>"
-            "</div>",
-            unsafe_allow_html=True,
-        )
+        # Credentials + grid rerun on their own when a checkbox is toggled
+        render_creds_and_grid(row)
 
     else:
         # Models grid (no sidebar)
         st.markdown(f"<div class='h1'>Choose a drone ({seg_label} → {ser_label})</div>", unsafe_allow_html=True)
         models = models_for(segment, series)
-        items = []
-        for _, r in models.iterrows():
-            subbits = []
-            eu_c = (r.get("eu_class_marking") or "").strip()
-            uk_c = (r.get("uk_class_marking") or "").strip()
-            if eu_c or uk_c:
-                subbits.append(f"Class: EU {eu_c if eu_c else '—'} • UK {uk_c if uk_c else '—'}")
-            yr = r.get("year_released", "")
-            if yr:
-                subbits.append(f"Released: {yr}")
-            sub = " • ".join(subbits)
-            items.append(
-                card_link(
-                    f"segment={segment}&series={series}&model={r['model_key']}",
-                    r.get("marketing_name", ""),
-                    sub=sub,
-                    img_url=resolve_img(r.get("image_url", "")),
-                )
+        items = [
+            card_link(f"segment={segment}&series={series}&model={key}", name, sub=sub, img_url=img)
+            for key, name, sub, img in zip(
+                models["model_key"].tolist(),
+                models["marketing_name"].tolist(),
+                models["card_sub"].tolist(),
+                models["resolved_image_url"].tolist(),
             )
+        ]
         st.markdown(
             f"<div style='display:flex;gap:14px;flex-wrap:wrap'>{''.join(items)}</div>",
             unsafe_allow_html=True,
@@ -0,0 +1,48 @@
+"""Pre-build the parsed caches dronify.py reads instead of the YAML files.
+
+* dji_drones_v3.parquet - Parquet copy of the dataset rows.
+* <name>.yaml.pkl       - pickle sidecars for load_yaml.
+
+Each is stamped with its YAML's (mtime_ns, size) and ignored once that no
+longer matches exactly.
+
+Both use the same helpers as the app (datacache.py), so the formats can't
+drift. Run this after editing the dataset or taxonomy (or as a deploy step)
+so the first visitor doesn't pay for YAML parsing:
+
+    python scripts/build_cache.py
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import datacache  # noqa: E402
+
+DATASET_PATH = ROOT / "dji_drones_v3.yaml"
+TAXONOMY_PATH = ROOT / "taxonomy.yaml"
+DATASET_PARQUET = DATASET_PATH.with_suffix(".parquet")
+
+
+def write_sidecar(path: Path):
+    """Parse path and write the sidecar load_yaml looks for."""
+    path_stamp = datacache.stamp(path)
+    obj = datacache.parse_yaml(path)
+    datacache.write_sidecar(path, obj, path_stamp)
+    print(f"wrote {datacache.sidecar_path(path).name}")
+    return obj, path_stamp
+
+
+def main():
+    dataset, dataset_stamp = write_sidecar(DATASET_PATH)
+    write_sidecar(TAXONOMY_PATH)
+    df = pd.DataFrame(dataset["data"])
+    datacache.write_parquet(df, DATASET_PARQUET, dataset_stamp)
+    print(f"wrote {DATASET_PARQUET.name}: {len(df)} rows")
+
+
+if __name__ == "__main__":
+    main()